@@ -4,8 +4,38 @@ import logging
 import os
 from dataclasses import dataclass
 
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 
+# Resampling algorithms GDAL supports when building overviews
+OVERVIEW_RESAMPLING_ALGORITHMS = (
+    "NEAREST",
+    "AVERAGE",
+    "RMS",
+    "BILINEAR",
+    "GAUSS",
+    "CUBIC",
+    "CUBICSPLINE",
+    "LANCZOS",
+    "MODE",
+)
+
+
+def read_overview_resampling() -> str:
+    """
+    Read the overview resampling algorithm from the OVERVIEW_RESAMPLING env variable so that a typo fails when the
+    server starts instead of failing every viewpoint the worker processes.
+
+    :return: The upper case name of the resampling algorithm, defaults to 'CUBIC'
+    :raises ValueError: If GDAL does not support the requested algorithm.
+    """
+    overview_resampling = os.getenv("OVERVIEW_RESAMPLING", "CUBIC").upper()
+    if overview_resampling not in OVERVIEW_RESAMPLING_ALGORITHMS:
+        raise ValueError(
+            f"Unsupported OVERVIEW_RESAMPLING={overview_resampling}, expected one of {OVERVIEW_RESAMPLING_ALGORITHMS}"
+        )
+    return overview_resampling
+
 
 @dataclass
 class ServerConfig:
@@ -22,14 +52,32 @@ class ServerConfig:
     :param viewpoint_status_table: The name of the viewpoint status DDB table, defaults to 'TSJobTable'
     :param viewpoint_request_queue: The name of the viewpoint request queue, defaults to 'TSJobQueue'
     :param efs_mount_name: The name of the EFS mount, defaults to 'ts-efs-volume'
+    :param viewpoint_request_wait_seconds: The number of seconds the worker long polls the viewpoint request queue,
+        clamped to the 0-20 seconds SQS allows, defaults to 20
+    :param viewpoint_request_batch_size: The maximum number of viewpoint requests the worker receives per poll,
+        clamped to the 1-10 messages SQS allows and limited to viewpoint_worker_threads, defaults to 1
+    :param viewpoint_worker_threads: The number of viewpoint requests the worker processes concurrently, at least 1,
+        defaults to 1
+    :param s3_transfer_max_concurrency: The number of concurrent range requests used to download an image,
+        defaults to 10
+    :param s3_transfer_chunk_size: The size in bytes of each range request used to download an image, defaults to 16 MiB
+    :param overview_resampling: The GDAL resampling algorithm used to build image overviews, one of
+        OVERVIEW_RESAMPLING_ALGORITHMS, defaults to 'CUBIC'.
+        'AVERAGE' or 'NEAREST' build overviews faster at some cost in preview and low zoom tile quality
     """
 
     aws_region: str = os.getenv("AWS_DEFAULT_REGION", "us-west-2")
     viewpoint_status_table: str = os.getenv("JOB_TABLE", "TSJobTable")
     viewpoint_request_queue: str = os.getenv("JOB_QUEUE", "TSJobQueue")
     efs_mount_name: str = os.getenv("EFS_MOUNT_NAME", "ts-efs-volume")
+    viewpoint_request_wait_seconds: int = min(max(int(os.getenv("VIEWPOINT_REQUEST_WAIT_SECONDS", 20)), 0), 20)
+    viewpoint_request_batch_size: int = min(max(int(os.getenv("VIEWPOINT_REQUEST_BATCH_SIZE", 1)), 1), 10)
+    viewpoint_worker_threads: int = max(int(os.getenv("VIEWPOINT_WORKER_THREADS", 1)), 1)
     sts_arn: str = os.getenv("STS_ARN", None)
     ddb_ttl_days: int = os.getenv("DDB_TTL_DAYS", 1)
+    s3_transfer_max_concurrency: int = int(os.getenv("S3_TRANSFER_MAX_CONCURRENCY", 10))
+    s3_transfer_chunk_size: int = int(os.getenv("S3_TRANSFER_CHUNK_SIZE", 16 * 1024 * 1024))
+    overview_resampling: str = read_overview_resampling()
     tile_server_log_level = logging.INFO
 
     OVERVIEW_FILE_EXTENSION = ".ovr"
@@ -47,7 +95,14 @@ class BotoConfig:
 
     The data schema is defined as follows:
     :param default:  Standard boto client configuration
+    :param s3_transfer: S3 transfer configuration used to download images as concurrent multipart ranges
     """
 
     # Required env configuration
     default: Config = Config(region_name=ServerConfig.aws_region, retries={"max_attempts": 15, "mode": "standard"})
+    s3_transfer: TransferConfig = TransferConfig(
+        multipart_threshold=ServerConfig.s3_transfer_chunk_size,
+        multipart_chunksize=ServerConfig.s3_transfer_chunk_size,
+        max_concurrency=ServerConfig.s3_transfer_max_concurrency,
+        use_threads=True,
+    )
@@ -81,8 +81,8 @@ async def lifespan(app: FastAPI) -> AbstractAsyncContextManager[None] | FastAPI:
     viewpoint_worker = ViewpointWorker(aws.sqs, aws.s3, aws.ddb, worker_logger)
     viewpoint_worker.start()
     yield
-    # shutdown functions after done serving requests
-    viewpoint_worker.join(timeout=20)
+    # shutdown functions after done serving requests, giving the worker's long poll time to return
+    viewpoint_worker.join(timeout=ServerConfig.viewpoint_request_wait_seconds + 5)
 
 
 # Initialize FastAPI app
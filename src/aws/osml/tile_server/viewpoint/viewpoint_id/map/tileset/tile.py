@@ -13,7 +13,7 @@ from aws.osml.tile_server.utils import get_media_type, get_tile_factory_pool
 
 
 def _invert_tile_row_index(tile_row: int, tile_matrix: int) -> int:
-    return 2**tile_matrix - 1 - tile_row
+    return (1 << tile_matrix) - 1 - tile_row
 
 
 tile_matrix_router = APIRouter(
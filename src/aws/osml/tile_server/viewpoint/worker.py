@@ -2,14 +2,16 @@
 
 import json
 import logging
+import os
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from enum import auto
 from logging import Logger
 from math import degrees
 from pathlib import Path
-from threading import Event, Thread
-from typing import Tuple
+from threading import BoundedSemaphore, Event, Thread
+from typing import List, Tuple
 
 import geojson
 from boto3.resources.base import ServiceResource
@@ -19,9 +21,9 @@ from osgeo import gdal, gdalconst
 from aws.osml.gdal import GDALCompressionOptions, GDALImageFormats, RangeAdjustmentType
 from aws.osml.image_processing import GDALTileFactory
 from aws.osml.photogrammetry import ImageCoordinate
-from aws.osml.tile_server.app_config import ServerConfig
+from aws.osml.tile_server.app_config import BotoConfig, ServerConfig
 from aws.osml.tile_server.models import ViewpointModel, ViewpointStatus
-from aws.osml.tile_server.services import DecimalEncoder, ViewpointRequestQueue, ViewpointStatusTable
+from aws.osml.tile_server.services import ViewpointRequestQueue, ViewpointStatusTable
 from aws.osml.tile_server.utils import (
     AutoLowerStringEnum,
     ThreadingLocalContextFilter,
@@ -43,6 +45,12 @@ class SupplementaryFileType(str, AutoLowerStringEnum):
     OVERVIEW = auto()
 
 
+SUPPLEMENTARY_FILE_EXTENSIONS = {
+    SupplementaryFileType.AUX: ServerConfig.AUXXML_FILE_EXTENSION,
+    SupplementaryFileType.OVERVIEW: ServerConfig.OVERVIEW_FILE_EXTENSION,
+}
+
+
 class ViewpointWorker(Thread):
     def __init__(
         self,
@@ -68,10 +76,24 @@ class ViewpointWorker(Thread):
         self.viewpoint_database = ViewpointStatusTable(aws_ddb, logger)
         self.logger = logger
         self.stop_event = Event()
+        self.message_executor = ThreadPoolExecutor(max_workers=ServerConfig.viewpoint_worker_threads)
+        # Never receive more messages than there are free threads to start on them before their visibility timeout
+        # expires. A slot is taken for each message submitted to the pool and given back when its processing is done.
+        self.free_slots = BoundedSemaphore(ServerConfig.viewpoint_worker_threads)
+        self.max_messages_per_poll = min(ServerConfig.viewpoint_request_batch_size, ServerConfig.viewpoint_worker_threads)
+        self.download_executor = ThreadPoolExecutor(
+            max_workers=len(SupplementaryFileType) * ServerConfig.viewpoint_worker_threads
+        )
 
     def join(self, timeout: float | None = ...) -> None:
         """
-        Join the ViewpointWorker threads together.
+        Join the ViewpointWorker threads together. Queued viewpoints that have not started are cancelled. Viewpoints
+        that are already being processed keep running on the message pool threads, which are not daemon threads, so
+        the process does not exit until they return, even after this join times out. Their results are not trusted:
+        once the interpreter starts shutting down, steps that need new threads (e.g. S3 transfers) fail. So a viewpoint
+        that finishes after the worker is stopped is neither marked READY nor removed from the queue; its message is
+        made visible again for another worker to process. The supplementary file pool is left running so in-flight
+        viewpoints can still reach that point.
 
         :param timeout: The maximum number of seconds to wait for the thread to finish execution. If `None`, the method
             will block until the thread is finished. (Default is `None`)
@@ -80,6 +102,7 @@ class ViewpointWorker(Thread):
         self.logger.info("ViewpointWorker Background Thread Stopping.")
         self.stop_event.set()
         Thread.join(self, timeout)
+        self.message_executor.shutdown(wait=False, cancel_futures=True)
 
     def run(self) -> None:
         """
@@ -87,24 +110,36 @@ class ViewpointWorker(Thread):
         pick up a message from ViewpointRequest SQS. Then, it will download an image from S3
         and save it to the local temp directory. Once that's completed, it will update the DynamoDB
         to reflect that this Viewpoint is READY to review. This function will run in the background.
+        The messages are processed concurrently on the message thread pool. Each poll asks for as many
+        messages as there are free threads, so a slow viewpoint only holds its own thread while the
+        worker keeps polling for the others.
 
         :return: None
         """
         self.logger.info("ViewpointWorker Background Thread Started.")
         while not self.stop_event.is_set():
+            # Wait for a free thread, checking regularly whether the worker has been stopped
+            if not self.free_slots.acquire(timeout=1):
+                continue
+            reserved_slots = 1
+            while reserved_slots < self.max_messages_per_poll and self.free_slots.acquire(blocking=False):
+                reserved_slots += 1
+
             self.logger.debug("Scanning for SQS messages")
             try:
                 attributes = ["correlation_id"]
                 messages = self.viewpoint_request_queue.queue.receive_messages(
-                    MessageAttributeNames=attributes, WaitTimeSeconds=5
+                    MessageAttributeNames=attributes,
+                    MaxNumberOfMessages=reserved_slots,
+                    WaitTimeSeconds=ServerConfig.viewpoint_request_wait_seconds,
                 )
-                for message in messages:
-                    correlation_id = message.message_attributes.get("correlation_id", {}).get("StringValue")
-                    if correlation_id:
-                        ThreadingLocalContextFilter.set_context({"correlation_id": correlation_id})
-                    else:
-                        ThreadingLocalContextFilter.set_context()
-                    self._process_message(message)
+                for index, message in enumerate(messages):
+                    if self.stop_event.is_set():
+                        self._release_messages(messages[index:])
+                        break
+                    future = self.message_executor.submit(self._process_message_in_context, message)
+                    reserved_slots -= 1
+                    future.add_done_callback(lambda _: self.free_slots.release())
 
             except ClientError as err:
                 self.logger.error(f"[Worker Background Thread] {err} / {traceback.format_exc()}")
@@ -112,14 +147,32 @@ class ViewpointWorker(Thread):
                 self.logger.error(f"[Worker Background Thread] {err} / {traceback.format_exc()}")
             except Exception as err:
                 self.logger.error(f"[Worker Background Thread] {err} / {traceback.format_exc()}")
+            finally:
+                # Give back the slots reserved for messages the poll did not return
+                for _ in range(reserved_slots):
+                    self.free_slots.release()
+
+    def _release_messages(self, messages: List) -> None:
+        """
+        Make received messages visible on the queue again right away so another worker can process them instead of
+        waiting for their visibility timeout to expire.
+
+        :param messages: The SQS messages this worker will not process.
+        :return: None
+        """
+        for message in messages:
+            try:
+                message.change_visibility(VisibilityTimeout=0)
+            except ClientError as err:
+                self.logger.warning(f"Unable to return message {message.message_id} to the queue. Error={err}")
 
     def download_image(self, viewpoint_item: ViewpointModel) -> None:
         """
         This method downloads an image file from an S3 bucket using the bucket_name and object_key attributes of a
         ViewpointModel instance. The downloaded image is saved under specific server configuration, and its path is
-        stored. The method also attempts to download optional files, logging their unavailability. Note: The method
-        assumes the existence of the following constants: OVERVIEW_FILE_EXTENSION and AUXXML_FILE_EXTENSION,
-        which represent the file extensions for the optional overview and aux files respectively.
+        stored. The method then attempts to download the optional files concurrently, logging their unavailability.
+        Note: The method assumes the existence of the following constants: OVERVIEW_FILE_EXTENSION and
+        AUXXML_FILE_EXTENSION, which represent the file extensions for the optional overview and aux files respectively.
 
         :param viewpoint_item: Instance of ViewpointModel representing the viewpoint item to be downloaded.
         :return: None
@@ -132,8 +185,13 @@ class ViewpointWorker(Thread):
             viewpoint_item.viewpoint_status = failed
             viewpoint_item.error_message = error_message
         else:
-            self._download_supplementary_file(viewpoint_item, SupplementaryFileType.OVERVIEW)
-            self._download_supplementary_file(viewpoint_item, SupplementaryFileType.AUX)
+            futures = [
+                self.download_executor.submit(self._download_supplementary_file, viewpoint_item, file_type)
+                for file_type in self._list_supplementary_files(viewpoint_item)
+            ]
+            # Surface any unexpected error from the downloads the same way a serial call would
+            for future in futures:
+                future.result()
 
     def create_tile_pyramid(self, viewpoint_item: ViewpointModel) -> None:
         """
@@ -203,10 +261,26 @@ class ViewpointWorker(Thread):
                 f"METRIC: TileFactory Create Time: {end_time - start_time} for {viewpoint_item.local_object_path}"
             )
 
+    def _process_message_in_context(self, message) -> None:
+        """
+        Process a viewpoint request message on a message pool thread, logging with the message's correlation id.
+
+        :param message: The SQS message containing the viewpoint request.
+        :return: None
+        """
+        correlation_id = message.message_attributes.get("correlation_id", {}).get("StringValue")
+        if correlation_id:
+            ThreadingLocalContextFilter.set_context({"correlation_id": correlation_id})
+        else:
+            ThreadingLocalContextFilter.set_context(None)
+        try:
+            self._process_message(message)
+        except Exception as err:
+            self.logger.error(f"[Worker Background Thread] {err} / {traceback.format_exc()}")
+
     def _process_message(self, message) -> None:
         self.logger.info(f"MESSAGE: {message.body}")
-        message_attributes = json.loads(message.body)
-        viewpoint_item = ViewpointModel.model_validate_json(json.dumps(message_attributes, cls=DecimalEncoder))
+        viewpoint_item = ViewpointModel.model_validate_json(message.body)
         if viewpoint_item.viewpoint_status != ViewpointStatus.REQUESTED:
             self.logger.error(
                 f"Cannot process {viewpoint_item.viewpoint_id} due to the incorrect "
@@ -217,6 +291,13 @@ class ViewpointWorker(Thread):
         self.download_image(viewpoint_item)
         self.create_tile_pyramid(viewpoint_item)
         self.extract_metadata(viewpoint_item)
+        if self.stop_event.is_set():
+            self.logger.warning(f"Worker stopped while processing {viewpoint_item.viewpoint_id}, returning it to the queue.")
+            self._release_messages([message])
+            return
+
+        if viewpoint_item.viewpoint_status != ViewpointStatus.FAILED:
+            self._release_cached_pages(viewpoint_item.local_object_path)
 
         self._update_status(viewpoint_item)
 
@@ -276,7 +357,9 @@ class ViewpointWorker(Thread):
         while retry_count < max_retries:
             try:
                 self.logger.info(f"Beginning download of {message_viewpoint_id}")
-                self.s3.meta.client.download_file(message_bucket_name, message_object_key, local_object_path_str)
+                self.s3.meta.client.download_file(
+                    message_bucket_name, message_object_key, local_object_path_str, Config=BotoConfig.s3_transfer
+                )
                 self.logger.info(f"Successfully download to {local_object_path_str}.")
                 viewpoint_status = None
                 error_message = None
@@ -308,6 +391,56 @@ class ViewpointWorker(Thread):
             retry_count += 1
         return viewpoint_status, error_message
 
+    def _release_cached_pages(self, local_object_path: str) -> None:
+        """
+        Ask the kernel to drop the page cache holding an image once the worker has finished reading all of it to
+        compute statistics, overviews, and metadata. Tiles only read small parts of an image so keeping the whole file
+        cached wastes memory needed by the tile factories. This is only a hint: it is skipped on platforms without
+        posix_fadvise and failures are logged, not raised.
+
+        :param local_object_path: The path of the downloaded image.
+
+        :return: None
+        """
+        if not hasattr(os, "posix_fadvise"):
+            return
+        try:
+            fd = os.open(local_object_path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+        except Exception as err:
+            self.logger.warning(f"Unable to release the cached pages of {local_object_path}. Error={err}")
+
+    def _list_supplementary_files(self, viewpoint_item: ViewpointModel) -> List[SupplementaryFileType]:
+        """
+        Lists the objects stored next to the image in S3 with a single request so that only the supplementary files
+        that exist are downloaded. All supplementary file types are returned if the bucket cannot be listed.
+
+        :param viewpoint_item: Item being processed by the worker.
+
+        :return: The supplementary file types available for the image.
+        """
+        try:
+            response = self.s3.meta.client.list_objects_v2(
+                Bucket=viewpoint_item.bucket_name, Prefix=viewpoint_item.object_key
+            )
+        except ClientError as err:
+            self.logger.info(f"Unable to list supplementary files for {viewpoint_item.viewpoint_id}, Error={err}")
+            return list(SupplementaryFileType)
+        if response.get("IsTruncated"):
+            return list(SupplementaryFileType)
+
+        sibling_keys = {content["Key"] for content in response.get("Contents", [])}
+        available_file_types = []
+        for file_type, extension in SUPPLEMENTARY_FILE_EXTENSIONS.items():
+            if viewpoint_item.object_key + extension in sibling_keys:
+                available_file_types.append(file_type)
+            else:
+                self.logger.info(f"No {file_type.value} file available for {viewpoint_item.viewpoint_id}")
+        return available_file_types
+
     def _download_supplementary_file(self, viewpoint_item: ViewpointModel, file_type: SupplementaryFileType) -> None:
         """
         Attempts to download associated supplementary file from S3, if present
@@ -322,20 +455,16 @@ class ViewpointWorker(Thread):
         message_object_key = viewpoint_item.object_key
         message_bucket_name = viewpoint_item.bucket_name
         local_object_path = viewpoint_item.local_object_path
-        extension_lookup = {
-            SupplementaryFileType.AUX: ServerConfig.AUXXML_FILE_EXTENSION,
-            SupplementaryFileType.OVERVIEW: ServerConfig.OVERVIEW_FILE_EXTENSION,
-        }
+        extension = SUPPLEMENTARY_FILE_EXTENSIONS[file_type]
         try:
             self.logger.info(f"Attempting to download optional {file_type.value} file for {message_viewpoint_id}")
             self.s3.meta.client.download_file(
                 message_bucket_name,
-                message_object_key + extension_lookup[file_type],
-                local_object_path + extension_lookup[file_type],
-            )
-            self.logger.info(
-                f"Successfully downloaded {file_type.value} file to {local_object_path + extension_lookup[file_type]}."
+                message_object_key + extension,
+                local_object_path + extension,
+                Config=BotoConfig.s3_transfer,
             )
+            self.logger.info(f"Successfully downloaded {file_type.value} file to {local_object_path + extension}.")
         except ClientError:
             self.logger.info(f"No {file_type.value} file available for {message_viewpoint_id}")
 
@@ -388,7 +517,7 @@ class ViewpointWorker(Thread):
         start_time = time.perf_counter()
         ds = tile_factory.raster_dataset
         overviews = get_standard_overviews(ds.RasterXSize, ds.RasterYSize, 1024)
-        ds.BuildOverviews("CUBIC", overviews)
+        ds.BuildOverviews(ServerConfig.overview_resampling, overviews)
         end_time = time.perf_counter()
         self.logger.info(f"METRIC: BuildOverviews Time: {end_time - start_time}" f" for {viewpoint_item.local_object_path}")
 
@@ -1,45 +0,0 @@
-#  Copyright 2023-2024 Amazon.com, Inc. or its affiliates.
-
-from unittest import TestCase
-
-import pytest
-from moto import mock_aws
-
-
-class TestRefreshableBotoSession(TestCase):
-    """Unit tests for the RefreshableBotoSession class."""
-
-    @pytest.mark.skip(reason="Test not implemented")
-    def test_refresh(self):
-        """Test the refresh method of the RefreshableBotoSession."""
-        pass
-
-    @pytest.mark.skip(reason="Test not implemented")
-    def test_refreshable_session(self):
-        """Test creating a refreshable session."""
-        pass
-
-
-@mock_aws
-class TestAwsServices(TestCase):
-    """Unit tests for initializing AWS services using mock environments."""
-
-    @pytest.mark.skip(reason="Test not implemented")
-    def test_initialize_ddb(self):
-        """Test initialization of DynamoDB."""
-        pass
-
-    @pytest.mark.skip(reason="Test not implemented")
-    def test_initialize_s3(self):
-        """Test initialization of S3."""
-        pass
-
-    @pytest.mark.skip(reason="Test not implemented")
-    def test_initialize_sqs(self):
-        """Test initialization of SQS."""
-        pass
-
-    @pytest.mark.skip(reason="Test not implemented")
-    def test_initialize_aws_services(self):
-        """Test the combined initialization of all AWS services."""
-        pass
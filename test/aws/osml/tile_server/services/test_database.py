@@ -8,7 +8,7 @@ import pytest
 from botocore.exceptions import ClientError
 from fastapi import HTTPException
 from moto import mock_aws
-from test_config import TestConfig
+from test_config import TestConfig, empty_viewpoint_table
 
 from aws.osml.gdal import RangeAdjustmentType
 from aws.osml.tile_server.models import ViewpointModel, ViewpointStatus
@@ -64,26 +64,33 @@ MOCK_VIEWPOINT_4 = ViewpointModel(
 )
 
 
-@mock_aws
 class TestViewpointStatusTable(TestCase):
     """Unit tests for the ViewpointStatusTable class."""
 
-    def setUp(self):
-        """Set up the DynamoDB mock environment."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up the virtual DynamoDB table once for every test in the class."""
         from aws.osml.tile_server.app_config import BotoConfig
 
-        self.ddb = boto3.resource("dynamodb", config=BotoConfig.default)
-        self.table = self.ddb.create_table(
+        cls.aws_mock = mock_aws(config=TestConfig.test_moto_config)
+        cls.aws_mock.start()
+
+        cls.ddb = boto3.resource("dynamodb", config=BotoConfig.default)
+        cls.table = cls.ddb.create_table(
             TableName=TestConfig.test_viewpoint_table_name,
             KeySchema=TestConfig.test_viewpoint_key_schema,
             AttributeDefinitions=TestConfig.test_viewpoint_attribute_def,
             BillingMode="PAY_PER_REQUEST",
         )
 
-    def tearDown(self):
-        """Clean up the mock environment."""
-        self.ddb = None
-        self.table = None
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the virtual DynamoDB table."""
+        cls.aws_mock.stop()
+
+    def setUp(self):
+        """Empty the virtual DynamoDB table so each test starts without any viewpoints."""
+        empty_viewpoint_table(self.table)
 
     def test_viewpoint_status_table_initialization(self):
         """Test the initialization of ViewpointStatusTable."""
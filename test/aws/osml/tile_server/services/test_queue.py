@@ -8,25 +8,32 @@ from unittest.mock import MagicMock
 import boto3
 from botocore.exceptions import ClientError
 from moto import mock_aws
-from test_config import TestConfig
+from test_config import TestConfig, drain_queue
 
 
-@mock_aws
 class TestViewpointRequestQueue(TestCase):
     """Unit tests for the ViewpointRequestQueue class."""
 
-    def setUp(self):
-        """Set up the virtual SQS queue for testing."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up the virtual SQS queue once for every test in the class."""
         from aws.osml.tile_server.app_config import BotoConfig
 
+        cls.aws_mock = mock_aws(config=TestConfig.test_moto_config)
+        cls.aws_mock.start()
+
         # Create a virtual SQS queue
-        self.sqs = boto3.resource("sqs", config=BotoConfig.default)
-        self.queue = self.sqs.create_queue(QueueName=TestConfig.test_viewpoint_request_queue_name)
+        cls.sqs = boto3.resource("sqs", config=BotoConfig.default)
+        cls.queue = cls.sqs.create_queue(QueueName=TestConfig.test_viewpoint_request_queue_name)
 
-    def tearDown(self):
-        """Clean up resources after each test."""
-        self.sqs = None
-        self.queue = None
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the virtual SQS queue."""
+        cls.aws_mock.stop()
+
+    def setUp(self):
+        """Drain the virtual SQS queue so each test starts with it empty."""
+        drain_queue(self.queue)
 
     def test_viewpoint_request_queue_initialization(self):
         """Test the initialization of the ViewpointRequestQueue."""
@@ -0,0 +1,33 @@
+#  Copyright 2024 Amazon.com, Inc. or its affiliates.
+
+import os
+import unittest
+from unittest import TestCase
+from unittest.mock import patch
+
+from aws.osml.tile_server.app_config import read_overview_resampling
+
+
+class TestAppConfig(TestCase):
+    """Unit tests for reading the tile server configuration."""
+
+    def test_read_overview_resampling_default(self):
+        """Test that overviews are built with CUBIC resampling when none is configured."""
+        with patch.dict(os.environ):
+            os.environ.pop("OVERVIEW_RESAMPLING", None)
+            self.assertEqual(read_overview_resampling(), "CUBIC")
+
+    @patch.dict(os.environ, {"OVERVIEW_RESAMPLING": "average"})
+    def test_read_overview_resampling_configured(self):
+        """Test reading a configured overview resampling algorithm regardless of case."""
+        self.assertEqual(read_overview_resampling(), "AVERAGE")
+
+    @patch.dict(os.environ, {"OVERVIEW_RESAMPLING": "CUBICC"})
+    def test_read_overview_resampling_unsupported(self):
+        """Test that an unsupported overview resampling algorithm is rejected."""
+        with self.assertRaises(ValueError):
+            read_overview_resampling()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -27,3 +27,38 @@ class TestConfig:
     test_viewpoint_key_schema = [{"AttributeName": "viewpoint_id", "KeyType": "HASH"}]
     test_viewpoint_attribute_def = [{"AttributeName": "viewpoint_id", "AttributeType": "S"}]
     test_viewpoint_request_queue_name: str = "TSJobQueue"
+
+    # All AWS calls in the tests are mocked, so moto does not need to reset the default boto3 session
+    test_moto_config = {"core": {"reset_boto3_session": False}}
+
+
+def empty_viewpoint_table(table) -> None:
+    """
+    Delete every viewpoint from a virtual DynamoDB table so a test can reuse it instead of recreating it.
+
+    :param table: The DynamoDB table resource to empty.
+    :return: None
+    """
+    scan_params = {"ProjectionExpression": "viewpoint_id"}
+    with table.batch_writer() as batch:
+        while True:
+            response = table.scan(**scan_params)
+            for item in response["Items"]:
+                batch.delete_item(Key={"viewpoint_id": item["viewpoint_id"]})
+            if "LastEvaluatedKey" not in response:
+                break
+            scan_params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def drain_queue(queue) -> None:
+    """
+    Delete every message from a virtual SQS queue. PurgeQueue can only be called once every 60 seconds, so tests
+    that reuse a queue drain it instead.
+
+    :param queue: The SQS queue resource to drain.
+    :return: None
+    """
+    while messages := queue.receive_messages(MaxNumberOfMessages=10):
+        queue.delete_messages(
+            Entries=[{"Id": str(i), "ReceiptHandle": message.receipt_handle} for i, message in enumerate(messages)]
+        )
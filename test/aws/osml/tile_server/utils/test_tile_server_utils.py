@@ -7,7 +7,7 @@ from unittest.mock import patch
 from osgeo import gdal
 from test_config import TestConfig
 
-from aws.osml.gdal import GDALCompressionOptions, GDALImageFormats
+from aws.osml.gdal import GDALCompressionOptions, GDALImageFormats, RangeAdjustmentType
 from aws.osml.tile_server.utils import (
     get_media_type,
     get_standard_overviews,
@@ -41,8 +41,15 @@ class TestTileServerUtils(TestCase):
         mock_tile_format = GDALImageFormats.NITF
         mock_tile_compression = GDALCompressionOptions.NONE
         mock_path = "path"
-        get_tile_factory_pool(mock_tile_format, mock_tile_compression, mock_path)
-        assert mock_factory.has_been_called_with(mock_tile_format, mock_tile_compression, mock_path)
+        get_tile_factory_pool.cache_clear()
+        first_pool = get_tile_factory_pool(mock_tile_format, mock_tile_compression, mock_path)
+        second_pool = get_tile_factory_pool(mock_tile_format, mock_tile_compression, mock_path)
+
+        mock_factory.assert_called_once_with(
+            mock_tile_format, mock_tile_compression, mock_path, None, RangeAdjustmentType.NONE
+        )
+        self.assertIs(first_pool, second_pool)
+        get_tile_factory_pool.cache_clear()
 
     def test_perform_gdal_translation(self):
         """Test performing a GDAL translation with a valid format."""
@@ -1,20 +1,29 @@
 #  Copyright 2023-2024 Amazon.com, Inc or its affiliates.
 
+import copy
 import json
 import os
 import shutil
+import tempfile
 import unittest
+from functools import lru_cache
+from pathlib import Path
 from unittest import TestCase
 from unittest.mock import patch
 
 import boto3
+from botocore.config import Config
 from cryptography.fernet import Fernet
 from fastapi.testclient import TestClient
 from moto import mock_aws
-from test_config import TestConfig
+from test_config import TestConfig, drain_queue, empty_viewpoint_table
+
+from aws.osml.tile_server.main import app
 
 TEST_INVALID_VIEWPOINT_ID = "invalid-viewpoint-id"
 
+TEST_TOKEN_KEY = Fernet.generate_key()
+
 TEST_BODY = {
     "bucket_name": TestConfig.test_bucket,
     "object_key": TestConfig.test_object_key,
@@ -41,27 +50,66 @@ VALID_UPDATE_TEST_BODY = {
 }
 
 
-@mock_aws
+def link_or_copy(source_path: str, destination_path: str) -> None:
+    """
+    Place a read-only test file at the destination without copying its contents when possible. A hard link is
+    tried first, then a symbolic link, and the file is only copied if neither is supported.
+
+    :param source_path: Path of the test data file.
+    :param destination_path: Path the file should be available at.
+    """
+    try:
+        os.link(source_path, destination_path)
+    except OSError:
+        try:
+            os.symlink(os.path.abspath(source_path), destination_path)
+        except OSError:
+            shutil.copy(source_path, destination_path)
+
+
+@lru_cache(maxsize=None)
+def load_expected_json(json_path: str) -> dict:
+    """
+    Parse an expected JSON result file once and reuse it for every test that compares against it. Callers that
+    modify the result must copy it first.
+
+    :param json_path: Path of the JSON file.
+    :return: The parsed JSON document.
+    """
+    return json.loads(Path(json_path).read_bytes())
+
+
 class TestRouterE2E(TestCase):
     """End-to-end tests for the tile_server API."""
 
-    @patch("aws.osml.tile_server.services.get_encryptor", return_value=Fernet(Fernet.generate_key()))
-    def setUp(self, mock_encryptor):
-        """Set up virtual AWS resources and the test client."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up virtual AWS resources once for every test in the class."""
         from aws.osml.tile_server.app_config import BotoConfig
 
+        cls.aws_mock = mock_aws(config=TestConfig.test_moto_config)
+        cls.aws_mock.start()
+
+        # Use the same token key for every test in the class
+        cls.encryptor_patcher = patch("aws.osml.tile_server.services.get_encryptor", return_value=Fernet(TEST_TOKEN_KEY))
+        cls.encryptor_patcher.start()
+
+        # Share one session and a pooled client configuration across the virtual resources
+        session = boto3.Session()
+        boto_config = BotoConfig.default.merge(Config(max_pool_connections=50))
+
         # Set up virtual S3
-        self.s3_resource = boto3.resource("s3", config=BotoConfig.default)
-        self.s3_resource.create_bucket(
+        cls.s3_resource = session.resource("s3", config=boto_config)
+        cls.s3_resource.create_bucket(
             Bucket=TestConfig.test_bucket, CreateBucketConfiguration={"LocationConstraint": os.environ["AWS_DEFAULT_REGION"]}
         )
-        self.s3_resource.meta.client.upload_file(
-            TestConfig.test_file_path, TestConfig.test_bucket, TestConfig.test_object_key
+        cls.s3_resource.meta.client.put_object(
+            Bucket=TestConfig.test_bucket, Key=TestConfig.test_object_key, Body=Path(TestConfig.test_file_path).read_bytes()
         )
 
         # Set up virtual DynamoDB
-        self.ddb = boto3.resource("dynamodb", config=BotoConfig.default)
-        self.table = self.ddb.create_table(
+        cls.ddb = session.resource("dynamodb", config=boto_config)
+        cls.table = cls.ddb.create_table(
             TableName=TestConfig.test_viewpoint_table_name,
             KeySchema=TestConfig.test_viewpoint_key_schema,
             AttributeDefinitions=TestConfig.test_viewpoint_attribute_def,
@@ -69,25 +117,30 @@ class TestRouterE2E(TestCase):
         )
 
         # Set up virtual SQS
-        self.sqs = boto3.resource("sqs", config=BotoConfig.default)
-        self.queue = self.sqs.create_queue(QueueName=TestConfig.test_viewpoint_request_queue_name)
+        cls.sqs = session.resource("sqs", config=boto_config)
+        cls.queue = cls.sqs.create_queue(QueueName=TestConfig.test_viewpoint_request_queue_name)
 
         # Set up the test client
-        from aws.osml.tile_server.main import app
+        cls.client = TestClient(app)
 
-        self.client = TestClient(app)
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the virtual AWS resources and the token key patch."""
+        cls.encryptor_patcher.stop()
+        cls.aws_mock.stop()
+
+    def setUp(self):
+        """Reset the virtual AWS resources and create a directory for the test's viewpoint files."""
+        # Keep the mocked viewpoint files in a temporary directory outside the working tree
+        self.viewpoints_dir = tempfile.mkdtemp(prefix="viewpoints-")
+
+        # Empty the table and queue instead of recreating them
+        empty_viewpoint_table(self.table)
+        drain_queue(self.queue)
 
     def tearDown(self):
-        """Clean up virtual AWS resources and test client."""
-        self.client = None
-        self.s3_resource = None
-        self.ddb = None
-        self.table = None
-        self.sqs = None
-        self.queue = None
-        tmp_viewpoints_path = os.path.join("test_tmp", "viewpoints")
-        if os.path.isdir(tmp_viewpoints_path):
-            shutil.rmtree(tmp_viewpoints_path)
+        """Remove the viewpoint files created by the test."""
+        shutil.rmtree(self.viewpoints_dir, ignore_errors=True)
 
     def mock_set_ready(self, viewpoint_id):
         """Mock the update of a viewpoint's status to READY."""
@@ -98,70 +151,68 @@ class TestRouterE2E(TestCase):
             ReturnValues="ALL_NEW",
         )
 
-    def mock_set_local_path(self, viewpoint_id, path):
-        """Mock the update of a viewpoint's local object path."""
+    def mock_set_ready_and_local_path(self, viewpoint_id, path):
+        """Mock the update of a viewpoint's status to READY and its local object path in a single write."""
         return self.table.update_item(
             Key={"viewpoint_id": viewpoint_id},
-            UpdateExpression="SET local_object_path = :local_object_path",
-            ExpressionAttributeValues={":local_object_path": path},
+            UpdateExpression="SET viewpoint_status = :viewpoint_status, local_object_path = :local_object_path",
+            ExpressionAttributeValues={":viewpoint_status": "READY", ":local_object_path": path},
             ReturnValues="ALL_NEW",
         )
 
-    def mock_download(self, viewpoint_id):
+    def mock_download(self, viewpoint_id) -> str:
         """Mock the download of an object to a local path."""
-        local_dir = os.path.join("test_tmp", "viewpoints", viewpoint_id)
+        local_dir = os.path.join(self.viewpoints_dir, viewpoint_id)
         local_path = os.path.join(local_dir, TestConfig.test_object_key)
         os.makedirs(local_dir, exist_ok=True)
-        shutil.copy(TestConfig.test_file_path, local_path)
-        self.mock_set_local_path(viewpoint_id, local_path)
+        link_or_copy(TestConfig.test_file_path, local_path)
+        return local_path
 
     def mock_extract_metadata(self, viewpoint_id):
         """Mock the extraction of metadata files."""
-        local_dir = os.path.join("test_tmp", "viewpoints", viewpoint_id)
-        shutil.copy(TestConfig.test_metadata_path, local_dir)
-        shutil.copy(TestConfig.test_stats_path, local_dir)
-        shutil.copy(TestConfig.test_info_path, local_dir)
-        shutil.copy(TestConfig.test_bounds_path, local_dir)
+        local_dir = os.path.join(self.viewpoints_dir, viewpoint_id)
+        for file_path in [
+            TestConfig.test_metadata_path,
+            TestConfig.test_stats_path,
+            TestConfig.test_info_path,
+            TestConfig.test_bounds_path,
+        ]:
+            link_or_copy(file_path, os.path.join(local_dir, os.path.basename(file_path)))
 
     def mock_create_viewpoint(self) -> str:
         """Create a viewpoint and set its status to READY."""
         viewpoint_data_res = self.client.post("/latest/viewpoints/", json=TEST_BODY)
         viewpoint_data = viewpoint_data_res.json()
-        self.mock_set_ready(viewpoint_data["viewpoint_id"])
-        self.mock_download(viewpoint_data["viewpoint_id"])
+        local_path = self.mock_download(viewpoint_data["viewpoint_id"])
+        self.mock_set_ready_and_local_path(viewpoint_data["viewpoint_id"], local_path)
         self.mock_extract_metadata(viewpoint_data["viewpoint_id"])
         return viewpoint_data["viewpoint_id"]
 
     def test_e2e_list_viewpoints_valid(self):
         """Test listing multiple valid viewpoints."""
-        test_body_2 = TEST_BODY.copy()
-        test_body_3 = TEST_BODY.copy()
-        test_body_2["viewpoint_id"] = "5678"
-        test_body_3["viewpoint_id"] = "9012"
-        self.client.post("/latest/viewpoints/", json=TEST_BODY)
-        self.client.post("/latest/viewpoints/", json=test_body_2)
-        self.client.post("/latest/viewpoints/", json=test_body_3)
+        viewpoint_data = self.client.post("/latest/viewpoints/", json=TEST_BODY).json()
+        with self.table.batch_writer() as batch:
+            for viewpoint_id in ["5678", "9012"]:
+                batch.put_item(Item={**viewpoint_data, "viewpoint_id": viewpoint_id})
 
         response = self.client.get("/latest/viewpoints/")
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.json()["items"]), 3)
 
-    @patch("aws.osml.tile_server.viewpoint.worker", autospec=True)
-    def test_e2e_create_viewpoint_valid(self, mock_worker):
+    def test_e2e_create_viewpoint_valid(self):
         """Test creating a valid viewpoint."""
         response = self.client.post("/latest/viewpoints/", json=TEST_BODY)
 
         self.assertEqual(response.status_code, 201)
         response_data = response.json()
 
-        with open("test/data/viewpoint_data_sample.json", "r") as output_json:
-            expected_json_result = json.load(output_json)
-            expected_json_result["viewpoint_id"] = response_data["viewpoint_id"]
-            expected_json_result["local_object_path"] = response_data["local_object_path"]
+        expected_json_result = copy.deepcopy(load_expected_json("test/data/viewpoint_data_sample.json"))
+        expected_json_result["viewpoint_id"] = response_data["viewpoint_id"]
+        expected_json_result["local_object_path"] = response_data["local_object_path"]
 
-            response_data["expire_time"] = None
-            self.assertEqual(response_data, expected_json_result)
+        response_data["expire_time"] = None
+        self.assertEqual(response_data, expected_json_result)
 
     def test_e2e_create_viewpoint_duplicate_id(self):
         """Test creating a viewpoint with invalid data."""
@@ -208,30 +259,31 @@ class TestRouterE2E(TestCase):
 
     def test_e2e_describe_viewpoint_invalid(self):
         """Test describing a viewpoint with an invalid ID."""
-        self.client.post("/latest/viewpoints/", json=TEST_BODY)
+        response = self.client.get(f"/latest/viewpoints/{TEST_INVALID_VIEWPOINT_ID}")
 
-        with self.assertRaises(Exception):
-            response = self.client.get(f"/latest/viewpoints/{TEST_INVALID_VIEWPOINT_ID}")
-            self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.status_code, 500)
+        self.assertIn("Invalid Key", response.json()["detail"])
 
-    def test_e2e_get_metadata_valid(self):
-        """Test retrieving metadata for a valid viewpoint."""
+    def test_e2e_get_image_metadata_valid(self):
+        """Test retrieving the metadata, info, and statistics for a valid viewpoint."""
         viewpoint_id = self.mock_create_viewpoint()
-        response = self.client.get(f"/latest/viewpoints/{viewpoint_id}/image/metadata")
+        for endpoint, expected_path in [
+            ("metadata", TestConfig.test_metadata_path),
+            ("info", TestConfig.test_info_path),
+            ("statistics", TestConfig.test_stats_path),
+        ]:
+            with self.subTest(endpoint=endpoint):
+                response = self.client.get(f"/latest/viewpoints/{viewpoint_id}/image/{endpoint}")
 
-        self.assertEqual(response.status_code, 200)
-
-        with open(TestConfig.test_metadata_path, "r") as output_json:
-            expected_json_result = json.load(output_json)
-            self.assertEqual(response.json(), expected_json_result)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), load_expected_json(expected_path))
 
     def test_e2e_get_metadata_invalid(self):
         """Test retrieving metadata for an invalid viewpoint ID."""
-        self.mock_create_viewpoint()
+        response = self.client.get(f"/latest/viewpoints/{TEST_INVALID_VIEWPOINT_ID}/image/metadata")
 
-        with self.assertRaises(Exception):
-            response = self.client.get(f"/latest/viewpoints/{TEST_INVALID_VIEWPOINT_ID}/image/metadata")
-            self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.status_code, 500)
+        self.assertIn("Invalid Key", response.json()["detail"])
 
     def test_e2e_get_bounds_valid(self):
         """Test retrieving bounds for a valid viewpoint."""
@@ -241,30 +293,6 @@ class TestRouterE2E(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json()["bounds"], [0, 0, 1024, 1024])
 
-    def test_e2e_get_info_valid(self):
-        """Test retrieving info for a valid viewpoint."""
-        viewpoint_id = self.mock_create_viewpoint()
-        response = self.client.get(f"/latest/viewpoints/{viewpoint_id}/image/info")
-
-        self.assertEqual(response.status_code, 200)
-        response_data = response.json()
-
-        with open(TestConfig.test_info_path, "r") as output_json:
-            expected_json_result = json.load(output_json)
-            self.assertEqual(response_data, expected_json_result)
-
-    def test_e2e_get_statistics_valid(self):
-        """Test retrieving statistics for a valid viewpoint."""
-        viewpoint_id = self.mock_create_viewpoint()
-        response = self.client.get(f"/latest/viewpoints/{viewpoint_id}/image/statistics")
-
-        self.assertEqual(response.status_code, 200)
-        response_data = response.json()
-
-        with open(TestConfig.test_stats_path, "r") as output_json:
-            expected_json_result = json.load(output_json)
-            self.assertEqual(response_data, expected_json_result)
-
     def test_e2e_get_preview(self):
         """Test retrieving a preview image for a valid viewpoint."""
         viewpoint_id = self.mock_create_viewpoint()
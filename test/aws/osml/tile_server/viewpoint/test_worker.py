@@ -1,79 +1,224 @@
 #  Copyright 2023-2024 Amazon.com, Inc or its affiliates.
 
-import copy
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from threading import Event
-from unittest import TestCase
-from unittest.mock import MagicMock, mock_open, patch
+from unittest import TestCase, skipUnless
+from unittest.mock import DEFAULT, MagicMock, call, create_autospec, patch
 
-import pytest
+import boto3
 from botocore.exceptions import ClientError
+from osgeo import gdalconst
 
-from aws.osml.gdal import RangeAdjustmentType
+from aws.osml.gdal import GDALCompressionOptions, GDALImageFormats, RangeAdjustmentType
+from aws.osml.tile_server.app_config import OVERVIEW_RESAMPLING_ALGORITHMS, BotoConfig, ServerConfig
 from aws.osml.tile_server.models import ViewpointModel, ViewpointStatus
-from aws.osml.tile_server.viewpoint import SupplementaryFileType
+from aws.osml.tile_server.services import ViewpointStatusTable
+from aws.osml.tile_server.viewpoint import SupplementaryFileType, ViewpointWorker
 
 
 class TestViewpointWorker(TestCase):
     """Unit tests for the ViewpointWorker class."""
 
-    def setUp(self):
-        """Set up the mock environment for each test."""
-        from aws.osml.tile_server.viewpoint import ViewpointWorker
-
-        self.mock_queue = MagicMock(name="queue")
-        self.mock_s3 = MagicMock(name="S3")
-        self.mock_ddb = MagicMock(name="ddb")
-        self.worker = ViewpointWorker(self.mock_queue, self.mock_s3, self.mock_ddb)
+    @classmethod
+    def setUpClass(cls):
+        """Set up the mock AWS resources and the worker once for every test in the class."""
+        # Spec the mocks from real resources so calls to methods boto3 doesn't have fail instead of passing silently
+        cls.mock_queue = create_autospec(boto3.resource("sqs", config=BotoConfig.default), instance=True)
+        cls.mock_s3 = create_autospec(boto3.resource("s3", config=BotoConfig.default), instance=True)
+        cls.mock_ddb = create_autospec(boto3.resource("dynamodb", config=BotoConfig.default), instance=True)
+        cls.worker = ViewpointWorker(cls.mock_queue, cls.mock_s3, cls.mock_ddb)
+        cls.worker_attributes = dict(vars(cls.worker))
+
+        # Write the metadata files to a temporary directory so tests can check what was written
+        cls.tmp_dir = tempfile.mkdtemp(prefix="viewpoint-worker-")
+        cls.local_viewpoint = MOCK_VIEWPOINT_ITEM_2.model_copy(update={"local_object_path": f"{cls.tmp_dir}/no_key"})
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the worker's thread pools and remove the files written by the tests."""
+        cls.worker_attributes["message_executor"].shutdown()
+        cls.worker_attributes["download_executor"].shutdown()
+        shutil.rmtree(cls.tmp_dir, ignore_errors=True)
 
-    def tearDown(self):
-        """Clean up the environment after each test."""
-        self.worker = None
+    def setUp(self):
+        """Reset the mock AWS resources and undo any changes a previous test made to the worker."""
+        vars(self.worker).clear()
+        vars(self.worker).update(self.worker_attributes)
+        for mock_resource in [
+            self.mock_queue,
+            self.mock_s3,
+            self.mock_ddb,
+            self.worker.viewpoint_request_queue.queue,
+            self.worker.viewpoint_database.table,
+        ]:
+            mock_resource.reset_mock(return_value=True, side_effect=True)
+        self.worker.stop_event.clear()
 
     def test_viewpoint_worker_initialization(self):
         """Test the initialization of the ViewpointWorker."""
         self.assertTrue(self.worker.daemon)
         self.assertIsInstance(self.worker.stop_event, Event)
+        self.assertIsInstance(self.worker.message_executor, ThreadPoolExecutor)
+        self.assertIsInstance(self.worker.download_executor, ThreadPoolExecutor)
+
+    def test_max_messages_per_poll(self):
+        """Test that a poll never receives more viewpoint requests than the worker has threads to process."""
+        for batch_size, worker_threads, expected in [(1, 1, 1), (10, 1, 1), (10, 4, 4), (2, 4, 2)]:
+            with self.subTest(batch_size=batch_size, worker_threads=worker_threads), patch.multiple(
+                ServerConfig, viewpoint_request_batch_size=batch_size, viewpoint_worker_threads=worker_threads
+            ):
+                worker = ViewpointWorker(self.mock_queue, self.mock_s3, self.mock_ddb)
+                self.assertEqual(worker.max_messages_per_poll, expected)
+                worker.message_executor.shutdown()
+                worker.download_executor.shutdown()
+
+    def test_run_processes_received_messages(self):
+        """Test that every message received from a long poll is processed."""
+        mock_messages = [MagicMock(), MagicMock(), MagicMock()]
+        remaining_messages = list(mock_messages)
+
+        def receive_messages(MaxNumberOfMessages, **kwargs):
+            if not remaining_messages:
+                self.worker.stop_event.set()
+            received_messages = remaining_messages[:MaxNumberOfMessages]
+            del remaining_messages[:MaxNumberOfMessages]
+            return received_messages
+
+        self.worker.viewpoint_request_queue.queue.receive_messages.side_effect = receive_messages
+        self.worker._process_message = MagicMock()
+
+        self.worker.run()
+
+        self.worker.viewpoint_request_queue.queue.receive_messages.assert_called_with(
+            MessageAttributeNames=["correlation_id"],
+            MaxNumberOfMessages=self.worker.max_messages_per_poll,
+            WaitTimeSeconds=ServerConfig.viewpoint_request_wait_seconds,
+        )
+        self.assertEqual(self.worker._process_message.call_count, len(mock_messages))
+
+    @patch.multiple(ServerConfig, viewpoint_request_batch_size=10, viewpoint_worker_threads=2)
+    def test_run_polls_while_a_viewpoint_is_processed(self):
+        """Test that a long-running viewpoint does not stop the worker from polling for work for its free threads."""
+        worker = ViewpointWorker(self.mock_queue, self.mock_s3, self.mock_ddb)
+        slow_message, fast_message = MagicMock(name="slow"), MagicMock(name="fast")
+        finish_slow_message = Event()
+        slow_message_finished = Event()
+        slow_message_finished_by_second_poll = []
+
+        def receive_messages(MaxNumberOfMessages, **kwargs):
+            poll_count = worker.viewpoint_request_queue.queue.receive_messages.call_count
+            if poll_count == 1:
+                return [slow_message]
+            if poll_count == 2:
+                slow_message_finished_by_second_poll.append(slow_message_finished.is_set())
+                return [fast_message]
+            finish_slow_message.set()
+            worker.stop_event.set()
+            return []
+
+        def process_message(message):
+            if message is slow_message:
+                finish_slow_message.wait(timeout=5)
+                slow_message_finished.set()
+
+        worker.viewpoint_request_queue.queue.receive_messages.side_effect = receive_messages
+        worker._process_message = MagicMock(side_effect=process_message)
+
+        worker.run()
+        worker.message_executor.shutdown()
+        worker.download_executor.shutdown()
+
+        self.assertEqual(slow_message_finished_by_second_poll, [False])
+        self.assertEqual(
+            [
+                poll.kwargs["MaxNumberOfMessages"]
+                for poll in worker.viewpoint_request_queue.queue.receive_messages.call_args_list[:2]
+            ],
+            [2, 1],
+        )
+        worker._process_message.assert_has_calls([call(slow_message), call(fast_message)], any_order=True)
+
+    def test_run_releases_messages_once_stopped(self):
+        """Test that a received batch is made visible on the queue again once the worker is stopped."""
+        mock_messages = [MagicMock(), MagicMock()]
 
-    @pytest.mark.skip(reason="Test not implemented")
-    def test_join(self):
-        pass
+        def receive_messages(**kwargs):
+            self.worker.stop_event.set()
+            return mock_messages
+
+        self.worker.viewpoint_request_queue.queue.receive_messages.side_effect = receive_messages
+        self.worker._process_message = MagicMock()
+
+        self.worker.run()
+
+        self.worker._process_message.assert_not_called()
+        for mock_message in mock_messages:
+            mock_message.change_visibility.assert_called_once_with(VisibilityTimeout=0)
+
+    def test_release_messages_client_error(self):
+        """Test that a message that cannot be made visible again is logged and the rest are still released."""
+        mock_messages = [MagicMock(), MagicMock()]
+        mock_messages[0].change_visibility.side_effect = ClientError(
+            {"Error": {"Code": "ReceiptHandleIsInvalid", "Message": "Mock Error"}}, "change_message_visibility"
+        )
+        self.worker.logger = MagicMock()
 
-    @pytest.mark.skip(reason="Test not implemented")
-    def test_run(self):
-        pass
+        self.worker._release_messages(mock_messages)
+
+        self.worker.logger.warning.assert_called_once()
+        mock_messages[1].change_visibility.assert_called_once_with(VisibilityTimeout=0)
+
+    @patch("aws.osml.tile_server.viewpoint.worker.ThreadingLocalContextFilter")
+    def test_process_message_in_context(self, mock_context_filter):
+        """Test processing a message with the correlation id attached to it."""
+        mock_message = MagicMock()
+        mock_message.message_attributes = {"correlation_id": {"StringValue": "mock_correlation_id"}}
+        self.worker._process_message = MagicMock(side_effect=ValueError("Mock Error"))
+        self.worker.logger = MagicMock()
+
+        self.worker._process_message_in_context(mock_message)
+
+        mock_context_filter.set_context.assert_called_once_with({"correlation_id": "mock_correlation_id"})
+        self.worker._process_message.assert_called_once_with(mock_message)
+        self.worker.logger.error.assert_called_once()
 
     def test_download_image_successful(self):
         """Test successful image download."""
-        mock_viewpoint = copy.deepcopy(MOCK_VIEWPOINT_ITEM)
+        mock_viewpoint = MOCK_VIEWPOINT_ITEM.model_copy()
         self.worker._create_local_tmp_directory = MagicMock(return_value="/tmp/1/no_key")
         self.worker._download_s3_file_to_local_tmp = MagicMock(return_value=(None, None))
+        self.worker._list_supplementary_files = MagicMock(return_value=list(SupplementaryFileType))
         self.worker._download_supplementary_file = MagicMock()
 
         self.worker.download_image(mock_viewpoint)
 
-        self.worker._download_supplementary_file.assert_called_with(mock_viewpoint, SupplementaryFileType.AUX)
+        self.worker._download_supplementary_file.assert_any_call(mock_viewpoint, SupplementaryFileType.OVERVIEW)
+        self.worker._download_supplementary_file.assert_any_call(mock_viewpoint, SupplementaryFileType.AUX)
 
     def test_download_image_failed(self):
         """Test image download failure handling."""
-        mock_viewpoint = copy.deepcopy(MOCK_VIEWPOINT_ITEM)
+        mock_viewpoint = MOCK_VIEWPOINT_ITEM.model_copy()
         self.worker._create_local_tmp_directory = MagicMock(return_value="/tmp/1/no_key")
         self.worker._download_s3_file_to_local_tmp = MagicMock(return_value=(ViewpointStatus.FAILED, "Failed"))
+        self.worker._list_supplementary_files = MagicMock()
         self.worker._download_supplementary_file = MagicMock()
 
         self.worker.download_image(mock_viewpoint)
 
         self.assertEqual(mock_viewpoint.viewpoint_status, ViewpointStatus.FAILED)
         self.assertEqual(mock_viewpoint.error_message, "Failed")
+        self.worker._list_supplementary_files.assert_not_called()
         self.worker._download_supplementary_file.assert_not_called()
 
-    @pytest.mark.skip(reason="Test not implemented")
-    def test_create_tile_pyramid(self):
-        pass
-
     def test_create_tile_pyramid_exception(self):
         """Test handling exceptions during tile pyramid creation."""
         self.worker.get_default_tile_factory_pool_for_viewpoint = MagicMock(side_effect=ValueError("Mock Error"))
-        mock_viewpoint = copy.deepcopy(MOCK_VIEWPOINT_ITEM)
+        mock_viewpoint = MOCK_VIEWPOINT_ITEM.model_copy()
 
         self.worker.create_tile_pyramid(mock_viewpoint)
 
@@ -82,23 +227,26 @@ class TestViewpointWorker(TestCase):
 
     def test_extract_metadata_successful(self):
         """Test successful metadata extraction."""
-        self.worker.get_default_tile_factory_pool_for_viewpoint = MagicMock()
-        self.worker._write_metadata = MagicMock()
-        self.worker._write_bounds = MagicMock()
-        self.worker._write_info = MagicMock()
-        self.worker._write_statistics = MagicMock()
-
-        self.worker.extract_metadata(MOCK_VIEWPOINT_ITEM)
-
-        self.worker._write_metadata.assert_called_once()
-        self.worker._write_bounds.assert_called_once()
-        self.worker._write_info.assert_called_once()
-        self.worker._write_statistics.assert_called_once()
+        with patch.multiple(
+            self.worker,
+            autospec=True,
+            get_default_tile_factory_pool_for_viewpoint=DEFAULT,
+            _write_metadata=DEFAULT,
+            _write_bounds=DEFAULT,
+            _write_info=DEFAULT,
+            _write_statistics=DEFAULT,
+        ) as mocks:
+            self.worker.extract_metadata(MOCK_VIEWPOINT_ITEM)
+
+        mocks["_write_metadata"].assert_called_once()
+        mocks["_write_bounds"].assert_called_once()
+        mocks["_write_info"].assert_called_once()
+        mocks["_write_statistics"].assert_called_once()
 
     def test_extract_metadata_exception(self):
         """Test handling exceptions during metadata extraction."""
         self.worker.get_default_tile_factory_pool_for_viewpoint = MagicMock(side_effect=ValueError("Mock Error"))
-        mock_viewpoint = copy.deepcopy(MOCK_VIEWPOINT_ITEM)
+        mock_viewpoint = MOCK_VIEWPOINT_ITEM.model_copy()
 
         self.worker.extract_metadata(mock_viewpoint)
 
@@ -108,60 +256,84 @@ class TestViewpointWorker(TestCase):
     def test_process_message_requested(self):
         """Test processing a message with status REQUESTED."""
         mock_message = MagicMock()
-        mock_message.body = (
-            '{"viewpoint_id": "1", "viewpoint_name": "mock_name", "viewpoint_status": "REQUESTED", '
-            '"bucket_name": "mock_bucket", "object_key": "mock_object", "tile_size": 512, '
-            '"range_adjustment": "NONE", "local_object_path": null, "error_message": null, "expire_time": null}'
-        )
+        mock_message.body = MOCK_REQUESTED_MESSAGE_BODY
         mock_message.delete = MagicMock()
 
-        self.worker.download_image = MagicMock()
+        # Attach every processing step to one parent mock so the order of the calls can be checked
+        mock_steps = MagicMock()
+        mock_steps.download_image.side_effect = lambda viewpoint: setattr(viewpoint, "local_object_path", "/tmp/1/mock")
+        for step in ["download_image", "create_tile_pyramid", "extract_metadata", "_release_cached_pages", "_update_status"]:
+            setattr(self.worker, step, getattr(mock_steps, step))
+
+        self.worker._process_message(mock_message)
+
+        self.assertEqual(
+            [name for name, _, _ in mock_steps.mock_calls],
+            ["download_image", "create_tile_pyramid", "extract_metadata", "_release_cached_pages", "_update_status"],
+        )
+        mock_steps._release_cached_pages.assert_called_once_with("/tmp/1/mock")
+        mock_message.delete.assert_called_once()
+
+    def test_process_message_failed_download(self):
+        """Test that the page cache is not released for an image that failed to download."""
+        mock_message = MagicMock()
+        mock_message.body = MOCK_REQUESTED_MESSAGE_BODY
+        self.worker.download_image = MagicMock(
+            side_effect=lambda viewpoint: setattr(viewpoint, "viewpoint_status", ViewpointStatus.FAILED)
+        )
         self.worker.create_tile_pyramid = MagicMock()
         self.worker.extract_metadata = MagicMock()
+        self.worker._release_cached_pages = MagicMock()
         self.worker._update_status = MagicMock()
 
         self.worker._process_message(mock_message)
 
-        self.worker.download_image.assert_called_once()
-        self.worker.create_tile_pyramid.assert_called_once()
-        self.worker.extract_metadata.assert_called_once()
+        self.worker._release_cached_pages.assert_not_called()
         self.worker._update_status.assert_called_once()
-        mock_message.delete.assert_called_once()
 
-    def test_process_message_not_requested(self):
-        """Test processing a message with a status other than REQUESTED."""
+    def test_process_message_stopped(self):
+        """Test that a viewpoint processed while the worker stops is returned to the queue instead of marked READY."""
         mock_message = MagicMock()
-        mock_message.body = (
-            '{"viewpoint_id": "1", "viewpoint_name": "mock_name", "viewpoint_status": "READY", '
-            '"bucket_name": "mock_bucket", "object_key": "mock_object", "tile_size": 512, '
-            '"range_adjustment": "NONE", "local_object_path": null, "error_message": null, "expire_time": null}'
-        )
-        mock_message.delete = MagicMock()
-
-        self.worker.download_image = MagicMock()
+        mock_message.body = MOCK_REQUESTED_MESSAGE_BODY
+        self.worker.download_image = MagicMock(side_effect=lambda viewpoint: self.worker.stop_event.set())
         self.worker.create_tile_pyramid = MagicMock()
         self.worker.extract_metadata = MagicMock()
+        self.worker._release_cached_pages = MagicMock()
         self.worker._update_status = MagicMock()
 
         self.worker._process_message(mock_message)
 
-        self.worker.download_image.assert_not_called()
-        self.worker.create_tile_pyramid.assert_not_called()
-        self.worker.extract_metadata.assert_not_called()
         self.worker._update_status.assert_not_called()
         mock_message.delete.assert_not_called()
+        mock_message.change_visibility.assert_called_once_with(VisibilityTimeout=0)
+
+    def test_process_message_not_requested(self):
+        """Test processing a message with each status other than REQUESTED."""
+        self.worker.download_image = MagicMock()
+        self.worker.create_tile_pyramid = MagicMock()
+        self.worker.extract_metadata = MagicMock()
+        self.worker._update_status = MagicMock()
+
+        for viewpoint_status, message_body in MOCK_NOT_REQUESTED_MESSAGE_BODIES.items():
+            with self.subTest(viewpoint_status=viewpoint_status):
+                mock_message = MagicMock()
+                mock_message.body = message_body
+
+                self.worker._process_message(mock_message)
+
+                self.worker.download_image.assert_not_called()
+                self.worker.create_tile_pyramid.assert_not_called()
+                self.worker.extract_metadata.assert_not_called()
+                self.worker._update_status.assert_not_called()
+                mock_message.delete.assert_not_called()
 
     def test_update_status_ready(self):
         """Test updating the viewpoint status to READY."""
-        self.worker.viewpoint_request_queue = self.mock_queue
-        self.worker.viewpoint_database = self.mock_ddb
+        self.worker.viewpoint_database = create_autospec(ViewpointStatusTable, instance=True)
 
-        self.worker._update_status(MOCK_VIEWPOINT_ITEM)
+        self.worker._update_status(MOCK_VIEWPOINT_ITEM.model_copy())
 
-        expected_viewpoint_item = copy.deepcopy(MOCK_VIEWPOINT_ITEM)
-        expected_viewpoint_item.viewpoint_status = ViewpointStatus.READY
-
-        self.mock_ddb.update_viewpoint.assert_called_with(expected_viewpoint_item)
+        self.worker.viewpoint_database.update_viewpoint.assert_called_with(MOCK_READY_VIEWPOINT_ITEM)
 
     @patch("aws.osml.tile_server.viewpoint.worker.ServerConfig")
     def test_create_local_tmp_directory(self, mock_server_config):
@@ -176,48 +348,51 @@ class TestViewpointWorker(TestCase):
         viewpoint_status, error_message = self.worker._download_s3_file_to_local_tmp(MOCK_VIEWPOINT_ITEM)
         self.assertIsNone(viewpoint_status)
         self.assertIsNone(error_message)
-
-    def test_download_s3_file_to_local_tmp_client_error_404(self):
-        """Test handling a 404 ClientError during S3 file download."""
-        self.mock_s3.meta.client.download_file = MagicMock(
-            side_effect=ClientError({"Error": {"Code": "404", "Message": "Mock Error"}}, "download_file")
+        self.mock_s3.meta.client.download_file.assert_called_once_with(
+            "no_bucket", "no_key", None, Config=BotoConfig.s3_transfer
         )
 
-        worker = self.worker
-        viewpoint_status, error_message = worker._download_s3_file_to_local_tmp(MOCK_VIEWPOINT_ITEM)
+    @skipUnless(hasattr(os, "posix_fadvise"), "posix_fadvise is not available on this platform")
+    @patch("aws.osml.tile_server.viewpoint.worker.os.posix_fadvise")
+    def test_release_cached_pages(self, mock_posix_fadvise):
+        """Test that the page cache of a downloaded image is released."""
+        local_object_path = Path(self.local_viewpoint.local_object_path)
+        local_object_path.write_bytes(b"mock image")
 
-        self.assertEqual(viewpoint_status, ViewpointStatus.FAILED)
-        self.assertIn("An error occurred (404)", error_message)
-        self.assertIn("The no_bucket bucket does not exist!", error_message)
+        self.worker._release_cached_pages(str(local_object_path))
 
-    def test_download_s3_file_to_local_tmp_client_error_403(self):
-        """Test handling a 403 ClientError during S3 file download."""
-        self.mock_s3.meta.client.download_file = MagicMock(
-            side_effect=ClientError({"Error": {"Code": "403", "Message": "Mock Error"}}, "download_file")
-        )
+        mock_posix_fadvise.assert_called_once()
+        self.assertEqual(mock_posix_fadvise.call_args.args[1:], (0, 0, os.POSIX_FADV_DONTNEED))
 
-        worker = self.worker
-        viewpoint_status, error_message = worker._download_s3_file_to_local_tmp(MOCK_VIEWPOINT_ITEM)
+    def test_release_cached_pages_missing_file(self):
+        """Test that failing to release the page cache is logged rather than raised."""
+        self.worker.logger = MagicMock()
 
-        self.assertEqual(viewpoint_status, ViewpointStatus.FAILED)
-        self.assertIn("An error occurred (403)", error_message)
-        self.assertIn("You do not have permission to access no_bucket bucket!", error_message)
+        self.worker._release_cached_pages(f"{self.tmp_dir}/missing")
 
-    def test_download_s3_file_to_local_tmp_client_error_400(self):
-        """Test handling a 400 ClientError during S3 file download."""
-        self.mock_s3.meta.client.download_file = MagicMock(
-            side_effect=ClientError({"Error": {"Code": "400", "Message": "Mock Error"}}, "download_file")
-        )
+        self.worker.logger.warning.assert_called_once()
 
-        worker = self.worker
-        viewpoint_status, error_message = worker._download_s3_file_to_local_tmp(MOCK_VIEWPOINT_ITEM)
+    def test_download_s3_file_to_local_tmp_client_error(self):
+        """Test handling ClientErrors during S3 file download."""
+        for error_code, detailed_error in [
+            ("404", "The no_bucket bucket does not exist!"),
+            ("403", "You do not have permission to access no_bucket bucket!"),
+            ("400", ""),
+        ]:
+            with self.subTest(error_code=error_code):
+                self.mock_s3.meta.client.download_file.side_effect = ClientError(
+                    {"Error": {"Code": error_code, "Message": "Mock Error"}}, "download_file"
+                )
 
-        self.assertEqual(viewpoint_status, ViewpointStatus.FAILED)
-        self.assertIn("An error occurred (400)", error_message)
+                viewpoint_status, error_message = self.worker._download_s3_file_to_local_tmp(MOCK_VIEWPOINT_ITEM)
+
+                self.assertEqual(viewpoint_status, ViewpointStatus.FAILED)
+                self.assertIn(f"An error occurred ({error_code})", error_message)
+                self.assertIn(detailed_error, error_message)
 
     def test_download_s3_file_to_local_tmp_other_exception(self):
         """Test handling a generic exception during S3 file download."""
-        self.mock_s3.meta.client.download_file = MagicMock(side_effect=ValueError("Mock error"))
+        self.mock_s3.meta.client.download_file.side_effect = ValueError("Mock error")
 
         worker = self.worker
         viewpoint_status, error_message = worker._download_s3_file_to_local_tmp(MOCK_VIEWPOINT_ITEM)
@@ -226,36 +401,62 @@ class TestViewpointWorker(TestCase):
         self.assertIn("Something went wrong!", error_message)
         self.assertIn("Mock error", error_message)
 
+    def test_list_supplementary_files(self):
+        """Test listing only the supplementary files that exist next to the image."""
+        self.mock_s3.meta.client.list_objects_v2.return_value = {
+            "Contents": [{"Key": "no_key"}, {"Key": "no_key.aux.xml"}],
+            "IsTruncated": False,
+        }
+
+        file_types = self.worker._list_supplementary_files(MOCK_VIEWPOINT_ITEM_2)
+
+        self.mock_s3.meta.client.list_objects_v2.assert_called_once_with(Bucket="no_bucket", Prefix="no_key")
+        self.assertEqual(file_types, [SupplementaryFileType.AUX])
+
+    def test_list_supplementary_files_client_error(self):
+        """Test falling back to every supplementary file type when the bucket cannot be listed."""
+        self.mock_s3.meta.client.list_objects_v2.side_effect = ClientError(
+            {"Error": {"Code": "403", "Message": "Mock Error"}}, "list_objects_v2"
+        )
+
+        file_types = self.worker._list_supplementary_files(MOCK_VIEWPOINT_ITEM_2)
+
+        self.assertEqual(file_types, list(SupplementaryFileType))
+
     def test_download_supplementary_file_overview(self):
         """Test downloading a supplementary OVERVIEW file."""
         self.worker._download_supplementary_file(MOCK_VIEWPOINT_ITEM_2, SupplementaryFileType.OVERVIEW)
 
-        self.mock_s3.meta.client.download_file.assert_called_with("no_bucket", "no_key.ovr", "/tmp/1/no_key.ovr")
+        self.mock_s3.meta.client.download_file.assert_called_with(
+            "no_bucket", "no_key.ovr", "/tmp/1/no_key.ovr", Config=BotoConfig.s3_transfer
+        )
 
     def test_download_supplementary_file_aux(self):
         """Test downloading a supplementary AUX file."""
         self.worker._download_supplementary_file(MOCK_VIEWPOINT_ITEM_2, SupplementaryFileType.AUX)
 
-        self.mock_s3.meta.client.download_file.assert_called_with("no_bucket", "no_key.aux.xml", "/tmp/1/no_key.aux.xml")
+        self.mock_s3.meta.client.download_file.assert_called_with(
+            "no_bucket", "no_key.aux.xml", "/tmp/1/no_key.aux.xml", Config=BotoConfig.s3_transfer
+        )
 
     def test_download_supplementary_file_client_error(self):
         """Test handling a ClientError during supplementary file download."""
-        self.mock_s3.meta.client.download_file = MagicMock(
-            side_effect=ClientError({"Error": {"Code": 500, "Message": "Mock Error"}}, "download_file")
+        self.mock_s3.meta.client.download_file.side_effect = ClientError(
+            {"Error": {"Code": 500, "Message": "Mock Error"}}, "download_file"
         )
         mock_logger = MagicMock()
         self.worker.logger = mock_logger
 
         self.worker._download_supplementary_file(MOCK_VIEWPOINT_ITEM_2, SupplementaryFileType.AUX)
 
-        self.mock_s3.meta.client.download_file.assert_called_with("no_bucket", "no_key.aux.xml", "/tmp/1/no_key.aux.xml")
+        self.mock_s3.meta.client.download_file.assert_called_with(
+            "no_bucket", "no_key.aux.xml", "/tmp/1/no_key.aux.xml", Config=BotoConfig.s3_transfer
+        )
         mock_logger.info.assert_called_with("No aux file available for 1")
 
     @patch("aws.osml.tile_server.viewpoint.worker.get_tile_factory_pool")
     def test_get_default_tile_factory_pool_for_viewpoint_no_range_adjustment(self, mock_get_tile_factory_pool):
         """Test getting the default tile factory pool with no range adjustment."""
-        from aws.osml.gdal import GDALCompressionOptions, GDALImageFormats
-
         self.worker.get_default_tile_factory_pool_for_viewpoint(MOCK_VIEWPOINT_ITEM)
 
         mock_get_tile_factory_pool.assert_called_with(
@@ -265,10 +466,6 @@ class TestViewpointWorker(TestCase):
     @patch("aws.osml.tile_server.viewpoint.worker.get_tile_factory_pool")
     def test_get_default_tile_factory_pool_for_viewpoint_with_range_adjustment(self, mock_get_tile_factory_pool):
         """Test getting the default tile factory pool with range adjustment."""
-        from osgeo import gdalconst
-
-        from aws.osml.gdal import GDALCompressionOptions, GDALImageFormats
-
         self.worker.get_default_tile_factory_pool_for_viewpoint(MOCK_VIEWPOINT_ITEM_4)
 
         mock_get_tile_factory_pool.assert_called_with(
@@ -299,6 +496,17 @@ class TestViewpointWorker(TestCase):
 
         mock_tile_factory.raster_dataset.BuildOverviews.assert_called_once_with("CUBIC", "mock overviews")
 
+    @patch("aws.osml.tile_server.viewpoint.worker.get_standard_overviews", return_value="mock overviews")
+    def test_create_image_pyramid_configured_resampling(self, mock_get_overviews):
+        """Test creating an image pyramid with each supported overview resampling algorithm besides the default."""
+        for resampling in [algorithm for algorithm in OVERVIEW_RESAMPLING_ALGORITHMS if algorithm != "CUBIC"]:
+            with self.subTest(resampling=resampling), patch.object(ServerConfig, "overview_resampling", resampling):
+                mock_tile_factory = MagicMock()
+
+                self.worker._create_image_pyramid(mock_tile_factory, MOCK_VIEWPOINT_ITEM_2)
+
+                mock_tile_factory.raster_dataset.BuildOverviews.assert_called_once_with(resampling, "mock overviews")
+
     def test_verify_tile_creation(self):
         """Test verifying tile creation."""
         mock_image_bytes = b"mock image bytes"
@@ -313,24 +521,22 @@ class TestViewpointWorker(TestCase):
         """Test writing metadata to a file."""
         mock_tile_factory = MagicMock()
         mock_tile_factory.raster_dataset.GetMetadata.return_value = {"data": "mock"}
-        open_mock = mock_open()
-        with patch("aws.osml.tile_server.viewpoint.worker.open", open_mock, create=True):
-            self.worker._write_metadata(mock_tile_factory, MOCK_VIEWPOINT_ITEM_2)
 
-        open_mock.assert_called_with("/tmp/1/no_key.metadata", "w")
-        open_mock.return_value.write.assert_called_once_with('{"metadata": {"data": "mock"}}')
+        self.worker._write_metadata(mock_tile_factory, self.local_viewpoint)
+
+        metadata_path = Path(self.local_viewpoint.local_object_path + ServerConfig.METADATA_FILE_EXTENSION)
+        self.assertEqual(json.loads(metadata_path.read_text()), {"metadata": {"data": "mock"}})
 
     def test_write_bounds(self):
         """Test writing bounds to a file."""
         mock_tile_factory = MagicMock()
         mock_tile_factory.raster_dataset.RasterXSize = 512
         mock_tile_factory.raster_dataset.RasterYSize = 256
-        open_mock = mock_open()
-        with patch("aws.osml.tile_server.viewpoint.worker.open", open_mock, create=True):
-            self.worker._write_bounds(mock_tile_factory, MOCK_VIEWPOINT_ITEM_2)
 
-        open_mock.assert_called_with("/tmp/1/no_key.bounds", "w")
-        open_mock.return_value.write.assert_called_once_with('{"bounds": [0, 0, 512, 256]}')
+        self.worker._write_bounds(mock_tile_factory, self.local_viewpoint)
+
+        bounds_path = Path(self.local_viewpoint.local_object_path + ServerConfig.BOUNDS_FILE_EXTENSION)
+        self.assertEqual(json.loads(bounds_path.read_text()), {"bounds": [0, 0, 512, 256]})
 
     def test_write_info(self):
         """Test writing info to a GeoJSON file."""
@@ -341,29 +547,21 @@ class TestViewpointWorker(TestCase):
         mock_tile_factory.raster_dataset.RasterXSize = 512
         mock_tile_factory.raster_dataset.RasterYSize = 256
         mock_tile_factory.sensor_model.image_to_world.return_value = mock_world_coordinate
-        open_mock = mock_open()
-        with patch("aws.osml.tile_server.viewpoint.worker.open", open_mock, create=True):
-            self.worker._write_info(mock_tile_factory, MOCK_VIEWPOINT_ITEM_2)
-
-        open_mock.assert_called_with("/tmp/1/no_key.geojson", "w")
-        expected_file_contents = (
-            '{"type": "FeatureCollection", "features": [{"type": "Feature", "id": "test1", "geometry": {"type": '
-            '"Polygon", "coordinates": [[[20.053523, 34.377468], [20.053523, 34.377468], [20.053523, 34.377468], '
-            '[20.053523, 34.377468], [20.053523, 34.377468]]]}, "properties": {}}]}'
-        )
-        open_mock.return_value.write.assert_called_once_with(expected_file_contents)
+
+        self.worker._write_info(mock_tile_factory, self.local_viewpoint)
+
+        info_path = Path(self.local_viewpoint.local_object_path + ServerConfig.INFO_FILE_EXTENSION)
+        self.assertEqual(json.loads(info_path.read_text()), MOCK_INFO_FEATURE_COLLECTION)
 
     @patch("aws.osml.tile_server.viewpoint.worker.gdal")
     def test_write_statistics(self, mock_gdal):
         """Test writing image statistics to a file."""
         mock_gdal.Info.return_value = {"mock": "gdal info"}
 
-        open_mock = mock_open()
-        with patch("aws.osml.tile_server.viewpoint.worker.open", open_mock, create=True):
-            self.worker._write_statistics(MOCK_VIEWPOINT_ITEM_2)
+        self.worker._write_statistics(self.local_viewpoint)
 
-        open_mock.assert_called_with("/tmp/1/no_key.stats", "w")
-        open_mock.return_value.write.assert_called_once_with('{"image_statistics": {"mock": "gdal info"}}')
+        statistics_path = Path(self.local_viewpoint.local_object_path + ServerConfig.STATISTICS_FILE_EXTENSION)
+        self.assertEqual(json.loads(statistics_path.read_text()), {"image_statistics": {"mock": "gdal info"}})
 
 
 MOCK_VIEWPOINT_ITEM = ViewpointModel(
@@ -379,6 +577,8 @@ MOCK_VIEWPOINT_ITEM = ViewpointModel(
     expire_time=None,
 )
 
+MOCK_READY_VIEWPOINT_ITEM = MOCK_VIEWPOINT_ITEM.model_copy(update={"viewpoint_status": ViewpointStatus.READY})
+
 MOCK_VIEWPOINT_ITEM_2 = ViewpointModel(
     viewpoint_id="1",
     viewpoint_name="test1",
@@ -404,3 +604,35 @@ MOCK_VIEWPOINT_ITEM_4 = ViewpointModel(
     error_message=None,
     expire_time=None,
 )
+
+MOCK_MESSAGE_ATTRIBUTES = {
+    "viewpoint_id": "1",
+    "viewpoint_name": "mock_name",
+    "bucket_name": "mock_bucket",
+    "object_key": "mock_object",
+    "tile_size": 512,
+    "range_adjustment": "NONE",
+    "local_object_path": None,
+    "error_message": None,
+    "expire_time": None,
+}
+
+MOCK_REQUESTED_MESSAGE_BODY = json.dumps({**MOCK_MESSAGE_ATTRIBUTES, "viewpoint_status": "REQUESTED"})
+
+MOCK_NOT_REQUESTED_MESSAGE_BODIES = {
+    viewpoint_status: json.dumps({**MOCK_MESSAGE_ATTRIBUTES, "viewpoint_status": viewpoint_status.value})
+    for viewpoint_status in ViewpointStatus
+    if viewpoint_status is not ViewpointStatus.REQUESTED
+}
+
+MOCK_INFO_FEATURE_COLLECTION = {
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "type": "Feature",
+            "id": "test1",
+            "geometry": {"type": "Polygon", "coordinates": [[[20.053523, 34.377468]] * 5]},
+            "properties": {},
+        }
+    ],
+}
@@ -1,13 +0,0 @@
-#  Copyright 2024 Amazon.com, Inc. or its affiliates.
-
-from unittest import TestCase
-
-import pytest
-
-
-class TestBounds(TestCase):
-    """Unit tests for bounds endpoint in tile_server."""
-
-    @pytest.mark.skip(reason="Test not implemented")
-    def test_get_bounds(self):
-        pass
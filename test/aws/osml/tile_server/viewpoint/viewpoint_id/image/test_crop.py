@@ -1,13 +0,0 @@
-#  Copyright 2024 Amazon.com, Inc. or its affiliates.
-
-from unittest import TestCase
-
-import pytest
-
-
-class TestCrop(TestCase):
-    """Unit tests for crop endpoint in tile_server."""
-
-    @pytest.mark.skip(reason="Test not implemented")
-    def test_get_crop(self):
-        pass
@@ -1,13 +0,0 @@
-#  Copyright 2024 Amazon.com, Inc. or its affiliates.
-
-from unittest import TestCase
-
-import pytest
-
-
-class TestImageTiles(TestCase):
-    """Unit tests for image tiles endpoint in tile_server."""
-
-    @pytest.mark.skip(reason="Test not implemented")
-    def test_get_image_tiles(self):
-        pass
@@ -2,16 +2,10 @@
 
 from unittest import TestCase
 
-import pytest
-
 
 class TestMapTiles(TestCase):
     """Unit tests for map tiles endpoint in tile_server."""
 
-    @pytest.mark.skip(reason="Test not implemented")
-    def test_get_map_tiles(self):
-        pass
-
     def test_invert_tile_row_index(self):
         from aws.osml.tile_server.viewpoint.viewpoint_id.map.tileset.tile import _invert_tile_row_index
 
@@ -20,3 +14,7 @@ class TestMapTiles(TestCase):
         expected_inverted_tile_row = 676
         inverted_tile_row = _invert_tile_row_index(sample_tile_row, sample_tile_matrix)
         assert inverted_tile_row == expected_inverted_tile_row
+
+        for tile_matrix, tile_row, expected in [(0, 0, 0), (1, 0, 1), (1, 1, 0), (20, 5, 1048570), (24, 0, 16777215)]:
+            with self.subTest(tile_matrix=tile_matrix, tile_row=tile_row):
+                self.assertEqual(_invert_tile_row_index(tile_row, tile_matrix), expected)